@@ -0,0 +1,118 @@
+"""Context-free grammar with First/Follow computation."""
+
+from dataclasses import dataclass
+
+EPSILON = 'ε'
+
+
+class GrammarError(Exception):
+    """Ошибка во входной грамматике."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    left: str
+    right: tuple
+
+    def __repr__(self):
+        return f"{self.left} -> {''.join(self.right) or EPSILON}"
+
+
+class Grammar:
+    def __init__(self, non_terminals, terminals, rules, start):
+        self.non_terminals = set(non_terminals)
+        self.terminals = set(terminals)
+        self.rules = list(rules)
+        self.start = start
+        self.first = {}
+        self.follow = {}
+        self.has_eps = {}
+        # First/Follow are computed on int bitmasks over a dense index of
+        # the terminals plus '$'; set unions become single `|=` ops. The
+        # masks never contain ε - nullability lives in has_eps instead.
+        self._bit_symbols = sorted(self.terminals) + ['$']
+        self._bit = {sym: 1 << i for i, sym in enumerate(self._bit_symbols)}
+        self._first_mask = {}
+
+    def _decode(self, mask):
+        symbols = self._bit_symbols
+        return {symbols[i] for i in range(mask.bit_length()) if mask >> i & 1}
+
+    def compute_first(self):
+        masks = {terminal: self._bit[terminal] for terminal in self.terminals}
+        has_eps = {terminal: False for terminal in self.terminals}
+        masks[EPSILON] = 0
+        has_eps[EPSILON] = True
+        for non_terminal in self.non_terminals:
+            masks[non_terminal] = 0
+            has_eps[non_terminal] = False
+        rules = self.rules
+        changed = True
+        while changed:
+            changed = False
+            for rule in rules:
+                left = rule.left
+                first_left = masks[left]
+                before = first_left
+                all_eps = True
+                for symbol in rule.right:
+                    first_left |= masks[symbol]
+                    if not has_eps[symbol]:
+                        all_eps = False
+                        break
+                if first_left != before:
+                    masks[left] = first_left
+                    changed = True
+                if all_eps and not has_eps[left]:
+                    has_eps[left] = True
+                    changed = True
+        self._first_mask = masks
+        self.has_eps = has_eps
+        self.first = {symbol: self._decode(mask)
+                      for symbol, mask in masks.items()}
+
+    def _first_sequence_mask(self, symbols):
+        masks = self._first_mask
+        has_eps = self.has_eps
+        result = 0
+        for symbol in symbols:
+            result |= masks[symbol]
+            if not has_eps[symbol]:
+                return result, False
+        return result, True
+
+    def first_sequence(self, symbols):
+        """First set of a sequence, plus whether it derives ε."""
+        mask, eps = self._first_sequence_mask(symbols)
+        return self._decode(mask), eps
+
+    def compute_follow(self):
+        masks = {non_terminal: 0 for non_terminal in self.non_terminals}
+        masks[self.start] = self._bit['$']
+        # First masks are fixed once compute_first has run, so First of a
+        # rule suffix can be cached for the whole Follow fixpoint.
+        self._fs_cache = {}
+        fs_cache = self._fs_cache
+        rules = self.rules
+        non_terminals = self.non_terminals
+        changed = True
+        while changed:
+            changed = False
+            for rule_id, rule in enumerate(rules):
+                right = rule.right
+                for idx, symbol in enumerate(right):
+                    if symbol not in non_terminals:
+                        continue
+                    suffix_key = (rule_id, idx + 1)
+                    tail = fs_cache.get(suffix_key)
+                    if tail is None:
+                        tail = self._first_sequence_mask(right[idx + 1:])
+                        fs_cache[suffix_key] = tail
+                    addition, tail_eps = tail
+                    if tail_eps:
+                        addition |= masks[rule.left]
+                    if addition & ~masks[symbol]:
+                        masks[symbol] |= addition
+                        changed = True
+        self.follow = {non_terminal: self._decode(mask)
+                       for non_terminal, mask in masks.items()}
@@ -0,0 +1,44 @@
+"""Line-oriented stdin readers for the grammar and query words."""
+
+import sys
+
+from grammar import EPSILON, Grammar, GrammarError, Rule
+
+
+def read_grammar():
+    """Read the grammar from stdin.
+
+    The whole input is read in one call and iterated line by line;
+    returns the grammar together with the iterator over the remaining
+    lines so read_words can pick up where the grammar ended.
+    """
+    lines = iter(sys.stdin.read().splitlines())
+    nxt = lines.__next__
+    try:
+        _, _, num_rules = (int(part) for part in nxt().split())
+        non_terminals = set(nxt().replace(' ', ''))
+        terminals = set(nxt().replace(' ', ''))
+        rules = []
+        for _ in range(num_rules):
+            line = nxt().strip()
+            if '->' not in line:
+                raise GrammarError('Некорректный формат правила')
+            left, right = line.split('->', 1)
+            left = left.strip()
+            right = right.strip()
+            right_symbols = tuple(right) if right and right != EPSILON else ()
+            rules.append(Rule(left, right_symbols))
+        start = nxt().strip()
+    except (StopIteration, ValueError):
+        raise GrammarError('Некорректный формат входа') from None
+    return Grammar(non_terminals, terminals, rules, start), lines
+
+
+def read_words(lines):
+    """Read the word count and words from the shared line iterator."""
+    nxt = lines.__next__
+    try:
+        num_words = int(nxt())
+        return [nxt() for _ in range(num_words)]
+    except (StopIteration, ValueError):
+        raise GrammarError('Некорректный формат входа') from None
@@ -0,0 +1,273 @@
+"""LR(0) parser: automaton construction and table-driven parsing."""
+
+from grammar import GrammarError, Rule
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+# Action kinds in the dense tables.
+_ERROR, _SHIFT, _REDUCE, _ACCEPT = 0, 1, 2, 3
+
+
+def _step(action_kind, action_arg, goto_tbl, rhs_len, rhs_lhs, tokens):
+    # The stack can outgrow any input-length bound when nullable rules
+    # push states without consuming input, so it is doubled on demand;
+    # overflow is a capacity issue, never a rejection.
+    stack = np.empty(2 * len(tokens) + 8, np.int32)
+    sp = 0
+    stack[0] = 0
+    cursor = 0
+    while True:
+        state = stack[sp]
+        tok = tokens[cursor]
+        kind = action_kind[state, tok]
+        if kind == 1:
+            if sp + 1 >= stack.shape[0]:
+                grown = np.empty(2 * stack.shape[0], np.int32)
+                grown[:stack.shape[0]] = stack
+                stack = grown
+            sp += 1
+            stack[sp] = action_arg[state, tok]
+            cursor += 1
+        elif kind == 2:
+            rule_id = action_arg[state, tok]
+            sp -= rhs_len[rule_id]
+            if sp < 0:
+                return False
+            target = goto_tbl[stack[sp], rhs_lhs[rule_id]]
+            if target < 0:
+                return False
+            if sp + 1 >= stack.shape[0]:
+                grown = np.empty(2 * stack.shape[0], np.int32)
+                grown[:stack.shape[0]] = stack
+                stack = grown
+            sp += 1
+            stack[sp] = target
+        elif kind == 3:
+            return True
+        else:
+            return False
+
+
+if njit is not None:
+    _step = njit(cache=True)(_step)
+
+
+class LR0Parser:
+    # Items are packed ints: rule_id * stride + dot_position. Compared to a
+    # frozen dataclass per item this makes hashing and equality plain int
+    # ops and shrinks the automaton's states accordingly.
+
+    def fit(self, grammar):
+        self.grammar = grammar
+        self.augmented_start = grammar.start + "'"
+        self.start_rule = Rule(self.augmented_start, (grammar.start,))
+        grammar.compute_first()
+        grammar.compute_follow()
+        self._rules = [self.start_rule] + grammar.rules
+        self._rule_rhs = [rule.right for rule in self._rules]
+        self._rule_lhs = [rule.left for rule in self._rules]
+        self._rule_lens = [len(right) for right in self._rule_rhs]
+        self._stride = max(self._rule_lens) + 1
+        self._start_items_by_lhs = {}
+        for rule_id, rule in enumerate(self._rules):
+            self._start_items_by_lhs.setdefault(rule.left, []).append(
+                rule_id * self._stride)
+        self._build_automaton()
+        self._build_parsing_table()
+        self._build_dense_tables()
+        # The closure cache only serves automaton construction; dropping
+        # it keeps the fitted parser's footprint to the states and tables.
+        self._closure_cache.clear()
+        return self
+
+    def _build_dense_tables(self):
+        """Lower the dict tables to dense arrays for the predict drivers.
+
+        The dict tables stay around only for inspection; predict always
+        runs on the dense layout, as NumPy arrays when available and as
+        nested lists otherwise.
+        """
+        terminals = sorted(self.grammar.terminals)
+        self._term_id = {t: i for i, t in enumerate(terminals)}
+        self._term_id['$'] = len(terminals)
+        nonterms = sorted(self.grammar.non_terminals)
+        self._nonterm_id = {n: i for i, n in enumerate(nonterms)}
+        rules = self.grammar.rules
+        rule_id = {rule: i for i, rule in enumerate(rules)}
+        rhs_len = [len(r.right) for r in rules]
+        rhs_lhs = [self._nonterm_id[r.left] for r in rules]
+        num_states = len(self.automaton)
+        num_terms = len(self._term_id)
+        action_kind = [[_ERROR] * num_terms for _ in range(num_states)]
+        action_arg = [[0] * num_terms for _ in range(num_states)]
+        goto_tbl = [[-1] * len(nonterms) for _ in range(num_states)]
+        for (state, symbol), (action, value) in self.action_table.items():
+            tok = self._term_id[symbol]
+            if action == 'shift':
+                action_kind[state][tok] = _SHIFT
+                action_arg[state][tok] = value
+            elif action == 'reduce':
+                action_kind[state][tok] = _REDUCE
+                action_arg[state][tok] = rule_id[value]
+            else:
+                action_kind[state][tok] = _ACCEPT
+        for (state, symbol), target in self.goto_table.items():
+            goto_tbl[state][self._nonterm_id[symbol]] = target
+        if np is not None:
+            action_kind = np.array(action_kind, np.int8)
+            action_arg = np.array(action_arg, np.int32)
+            goto_tbl = np.array(goto_tbl, np.int32)
+            rhs_len = np.array(rhs_len, np.int32)
+            rhs_lhs = np.array(rhs_lhs, np.int32)
+        self.action_kind = action_kind
+        self.action_arg = action_arg
+        self.goto_tbl = goto_tbl
+        self._rhs_len = rhs_len
+        self._rhs_lhs = rhs_lhs
+
+    def encode(self, word):
+        """Map a word to terminal ids ending in '$'; None on unknowns."""
+        term_id = self._term_id
+        tokens = []
+        for symbol in word:
+            tok = term_id.get(symbol)
+            if tok is None:
+                return None
+            tokens.append(tok)
+        tokens.append(term_id['$'])
+        if np is not None:
+            return np.array(tokens, np.int32)
+        return tokens
+
+    def _next_symbol(self, item):
+        rule_id, dot = divmod(item, self._stride)
+        right = self._rule_rhs[rule_id]
+        if dot < len(right):
+            return right[dot]
+        return None
+
+    def _closure(self, items):
+        seed = frozenset(items)
+        cached = self._closure_cache.get(seed)
+        if cached is not None:
+            return cached
+        result = set(seed)
+        worklist = list(seed)
+        stride = self._stride
+        rule_rhs = self._rule_rhs
+        start_items = self._start_items_by_lhs
+        while worklist:
+            item = worklist.pop()
+            rule_id, dot = divmod(item, stride)
+            right = rule_rhs[rule_id]
+            if dot == len(right):
+                continue
+            for new_item in start_items.get(right[dot], ()):
+                if new_item not in result:
+                    result.add(new_item)
+                    worklist.append(new_item)
+        closed = frozenset(result)
+        self._closure_cache[seed] = closed
+        return closed
+
+    def _build_automaton(self):
+        self._closure_cache = {}
+        start_item = 0  # start_rule has rule_id 0, dot at position 0
+        initial_state = self._closure({start_item})
+        self.automaton = [initial_state]
+        self._state_index = {initial_state: 0}
+        self.transitions = {}
+        idx = 0
+        while idx < len(self.automaton):
+            state = self.automaton[idx]
+            buckets = {}
+            for item in state:
+                next_sym = self._next_symbol(item)
+                if next_sym is not None:
+                    buckets.setdefault(next_sym, set()).add(item + 1)
+            for symbol, seed in buckets.items():
+                key = self._closure(seed)
+                state_idx = self._state_index.get(key)
+                if state_idx is None:
+                    state_idx = len(self.automaton)
+                    self.automaton.append(key)
+                    self._state_index[key] = state_idx
+                self.transitions[(idx, symbol)] = state_idx
+            idx += 1
+
+    def _build_parsing_table(self):
+        self.action_table = {}
+        self.goto_table = {}
+        for (idx, symbol), target in self.transitions.items():
+            if symbol in self.grammar.non_terminals:
+                self.goto_table[(idx, symbol)] = target
+            else:
+                self.action_table[(idx, symbol)] = ('shift', target)
+        action = self.action_table
+        aug = self.augmented_start
+        terminals_plus_end = frozenset(self.grammar.terminals) | {'$'}
+        stride = self._stride
+        rule_lens = self._rule_lens
+        for idx, state in enumerate(self.automaton):
+            for item in state:
+                rule_id, dot = divmod(item, stride)
+                if dot != rule_lens[rule_id]:
+                    continue
+                rule = self._rules[rule_id]
+                if rule.left == aug:
+                    existing = action.get((idx, '$'))
+                    if existing is not None and existing != ('accept', None):
+                        raise GrammarError('Грамматика не является LR(0)')
+                    action[(idx, '$')] = ('accept', None)
+                    continue
+                reduce_entry = ('reduce', rule)
+                for terminal in terminals_plus_end:
+                    existing = action.get((idx, terminal))
+                    if existing is not None and existing != reduce_entry:
+                        raise GrammarError('Грамматика не является LR(0)')
+                    action[(idx, terminal)] = reduce_entry
+
+    def predict(self, word):
+        """Accepts either a raw word or an array from encode()."""
+        tokens = self.encode(word) if isinstance(word, str) else word
+        if tokens is None:
+            return False
+        if np is not None:
+            return bool(_step(self.action_kind, self.action_arg,
+                              self.goto_tbl, self._rhs_len, self._rhs_lhs,
+                              tokens))
+        action_kind = self.action_kind
+        action_arg = self.action_arg
+        goto_tbl = self.goto_tbl
+        rhs_len = self._rhs_len
+        rhs_lhs = self._rhs_lhs
+        stack = [0]
+        cursor = 0
+        while True:
+            state = stack[-1]
+            tok = tokens[cursor]
+            kind = action_kind[state][tok]
+            if kind == _SHIFT:
+                stack.append(action_arg[state][tok])
+                cursor += 1
+            elif kind == _REDUCE:
+                rule_id = action_arg[state][tok]
+                k = rhs_len[rule_id]
+                if k:
+                    del stack[-k:]
+                target = goto_tbl[stack[-1]][rhs_lhs[rule_id]]
+                if target < 0:
+                    return False
+                stack.append(target)
+            elif kind == _ACCEPT:
+                return True
+            else:
+                return False
@@ -0,0 +1,482 @@
+"""Canonical LR(1) parser built on the same grammar module."""
+
+import hashlib
+import os
+import pickle
+from collections import deque
+
+from grammar import GrammarError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
+# Action kinds in the dense tables.
+_ERROR, _SHIFT, _REDUCE, _ACCEPT = 0, 1, 2, 3
+
+_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'lr1')
+# Bump when the persisted table layout changes.
+_TABLE_FORMAT = 1
+
+
+def _drive(action_kind, action_arg, goto_tbl, rhs_len, rhs_lhs, tokens):
+    # The stack can outgrow any input-length bound when nullable rules
+    # push states without consuming input, so it is doubled on demand;
+    # overflow is a capacity issue, never a rejection.
+    stack = np.empty(2 * len(tokens) + 16, np.int32)
+    sp = 0
+    stack[0] = 0
+    cursor = 0
+    while True:
+        state = stack[sp]
+        tok = tokens[cursor]
+        kind = action_kind[state, tok]
+        if kind == 1:
+            if sp + 1 >= stack.shape[0]:
+                grown = np.empty(2 * stack.shape[0], np.int32)
+                grown[:stack.shape[0]] = stack
+                stack = grown
+            sp += 1
+            stack[sp] = action_arg[state, tok]
+            cursor += 1
+        elif kind == 2:
+            rule_id = action_arg[state, tok]
+            sp -= rhs_len[rule_id]
+            if sp < 0:
+                return False
+            target = goto_tbl[stack[sp], rhs_lhs[rule_id]]
+            if target < 0:
+                return False
+            if sp + 1 >= stack.shape[0]:
+                grown = np.empty(2 * stack.shape[0], np.int32)
+                grown[:stack.shape[0]] = stack
+                stack = grown
+            sp += 1
+            stack[sp] = target
+        elif kind == 3:
+            return True
+        else:
+            return False
+
+
+if njit is not None:
+    _drive = njit(cache=True)(_drive)
+
+
+class LR1Item:
+    """An LR(1) core with the whole set of lookaheads that share it.
+
+    Symbols are small int ids and the lookahead is an int bitmask over
+    the terminal ids, so hashing and set arithmetic stay on ints.
+    Instances are interned through make(): equal items are the same
+    object, which makes equality an identity test and caches the hash.
+    """
+
+    __slots__ = ('left', 'right', 'dot', 'lookahead', '_hash')
+
+    _pool = {}
+
+    @classmethod
+    def make(cls, left, right, dot, lookahead):
+        key = (left,
+               right if isinstance(right, tuple) else tuple(right),
+               dot, lookahead)
+        item = cls._pool.get(key)
+        if item is None:
+            item = cls.__new__(cls)
+            item.left, item.right, item.dot, item.lookahead = key
+            item._hash = hash(key)
+            cls._pool[key] = item
+        return item
+
+    def next_symbol(self):
+        if self.dot < len(self.right):
+            return self.right[self.dot]
+        return None
+
+    def is_complete(self):
+        return self.dot == len(self.right)
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        before = ' '.join(map(str, self.right[:self.dot]))
+        after = ' '.join(map(str, self.right[self.dot:]))
+        return f"{self.left} -> {before}•{after}, {self.lookahead:b}"
+
+
+class _State:
+    """A closed item set with its items bucketed by next symbol.
+
+    Complete items are split off in the same pass, so table
+    construction never has to rescan the state for them.
+    """
+
+    __slots__ = ('items', 'by_next', 'completes')
+
+    def __init__(self, items):
+        self.items = items
+        by_next = {}
+        completes = []
+        for item in items:
+            next_sym = item.next_symbol()
+            if next_sym is not None:
+                by_next.setdefault(next_sym, []).append(item)
+            else:
+                completes.append(item)
+        self.by_next = by_next
+        self.completes = completes
+
+
+class LR1Parser:
+    # Everything predict/encode needs; exactly what save/load persist.
+    _TABLE_ATTRS = ('id2sym', 'sym2id', 'num_terms', 'action_kind',
+                    'action_arg', 'goto_tbl', '_rhs_len', '_rhs_lhs')
+
+    def save(self, path):
+        """Persist the compiled parse tables with pickle."""
+        with open(path, 'wb') as fh:
+            pickle.dump({attr: getattr(self, attr)
+                         for attr in self._TABLE_ATTRS}, fh)
+
+    @classmethod
+    def load(cls, path):
+        """Recreate a parser from tables written by save()."""
+        parser = cls()
+        parser._load_tables(path)
+        return parser
+
+    def _load_tables(self, path):
+        with open(path, 'rb') as fh:
+            data = pickle.load(fh)
+        for attr in self._TABLE_ATTRS:
+            setattr(self, attr, data[attr])
+
+    @staticmethod
+    def _cache_path(grammar):
+        key_src = repr((_TABLE_FORMAT, sorted(grammar.terminals),
+                        sorted(grammar.non_terminals), grammar.start,
+                        grammar.rules))
+        key = hashlib.sha1(key_src.encode()).hexdigest()
+        return os.path.join(_CACHE_DIR, key + '.pkl')
+
+    def fit(self, grammar, cache=True):
+        self.grammar = grammar
+        self.augmented_start = grammar.start + "'"
+        cache_path = self._cache_path(grammar) if cache else None
+        if cache_path is not None and os.path.exists(cache_path):
+            try:
+                self._load_tables(cache_path)
+                return self
+            except (OSError, pickle.UnpicklingError, KeyError, EOFError):
+                pass  # stale or corrupt cache entry; rebuild below
+        grammar.compute_first()
+        # Terminal ids coincide with the grammar's First bit indices, so
+        # a First mask is directly a lookahead mask.
+        terminal_order = grammar._bit_symbols
+        self.num_terms = len(terminal_order)
+        self.id2sym = (list(terminal_order)
+                       + sorted(grammar.non_terminals)
+                       + [self.augmented_start])
+        self.sym2id = {sym: i for i, sym in enumerate(self.id2sym)}
+        self._end_bit = 1 << self.sym2id['$']
+        self._first_mask_id = [0] * len(self.id2sym)
+        self._has_eps_id = [False] * len(self.id2sym)
+        for sym, mask in grammar._first_mask.items():
+            sym_id = self.sym2id.get(sym)
+            if sym_id is not None:
+                self._first_mask_id[sym_id] = mask
+                self._has_eps_id[sym_id] = grammar.has_eps[sym]
+        sym2id = self.sym2id
+        self._rules_enc = [
+            (sym2id[rule.left],
+             tuple(sym2id[sym] for sym in rule.right),
+             rule)
+            for rule in grammar.rules]
+        self._rules_by_lhs = {}
+        for lhs_id, right_ids, _ in self._rules_enc:
+            self._rules_by_lhs.setdefault(lhs_id, []).append(right_ids)
+        self._first_cache = {}
+        # The only betas closure can ever ask about are rule suffixes
+        # (including the augmented rule's), so their FIRST masks are
+        # enumerable up front; equal suffixes share one cache entry.
+        start_right = (sym2id[grammar.start],)
+        for right_ids in [start_right] + [r for _, r, _ in self._rules_enc]:
+            for pos in range(len(right_ids) + 1):
+                self._first_beta_mask(right_ids[pos:], 0)
+        self.build_states()
+        self.build_tables()
+        self._build_dense_tables()
+        if cache_path is not None:
+            try:
+                os.makedirs(_CACHE_DIR, exist_ok=True)
+                self.save(cache_path)
+            except OSError:
+                pass  # caching is best-effort
+        return self
+
+    def _build_dense_tables(self):
+        """Lower the dict tables to dense arrays for predict.
+
+        The dict tables stay around only for inspection; predict runs on
+        the dense layout, as NumPy arrays when available and as nested
+        lists otherwise.
+        """
+        sym2id = self.sym2id
+        num_terms = self.num_terms
+        num_states = len(self.states)
+        # A column per non-terminal id (offset by num_terms); the
+        # augmented-start column is never entered but keeps the
+        # id -> column math trivial.
+        num_nonterms = len(self.id2sym) - num_terms
+        rule_index = {}
+        rhs_len = []
+        rhs_lhs = []
+        for i, (lhs_id, right_ids, _) in enumerate(self._rules_enc):
+            rule_index[(self.id2sym[lhs_id], right_ids)] = i
+            rhs_len.append(len(right_ids))
+            rhs_lhs.append(lhs_id - num_terms)
+        action_kind = [[_ERROR] * num_terms for _ in range(num_states)]
+        action_arg = [[0] * num_terms for _ in range(num_states)]
+        goto_tbl = [[-1] * num_nonterms for _ in range(num_states)]
+        for idx, actions in enumerate(self.action_table):
+            for symbol, action in actions.items():
+                tok = sym2id[symbol]
+                if action[0] == 'shift':
+                    action_kind[idx][tok] = _SHIFT
+                    action_arg[idx][tok] = action[1]
+                elif action[0] == 'reduce':
+                    action_kind[idx][tok] = _REDUCE
+                    action_arg[idx][tok] = rule_index[(action[1], action[2])]
+                else:
+                    action_kind[idx][tok] = _ACCEPT
+        for idx, gotos in enumerate(self.goto_table):
+            for symbol, target in gotos.items():
+                goto_tbl[idx][sym2id[symbol] - num_terms] = target
+        if np is not None:
+            action_kind = np.array(action_kind, np.int8)
+            action_arg = np.array(action_arg, np.int32)
+            goto_tbl = np.array(goto_tbl, np.int32)
+            rhs_len = np.array(rhs_len, np.int32)
+            rhs_lhs = np.array(rhs_lhs, np.int32)
+        self.action_kind = action_kind
+        self.action_arg = action_arg
+        self.goto_tbl = goto_tbl
+        self._rhs_len = rhs_len
+        self._rhs_lhs = rhs_lhs
+
+    def encode(self, word):
+        """Map a word to terminal ids ending in '$'; None on unknowns."""
+        sym2id = self.sym2id
+        num_terms = self.num_terms
+        tokens = []
+        for symbol in word:
+            tok = sym2id.get(symbol)
+            if tok is None or tok >= num_terms:
+                return None
+            tokens.append(tok)
+        tokens.append(sym2id['$'])
+        if np is not None:
+            return np.array(tokens, np.int32)
+        return tokens
+
+    def _first_beta_mask(self, beta, la_mask):
+        """Lookahead mask of FIRST(beta · la) over terminal bits.
+
+        The beta-only part is cached by the beta tuple, since the same
+        suffixes recur across thousands of closure items.
+        """
+        cached = self._first_cache.get(beta)
+        if cached is None:
+            first_mask = self._first_mask_id
+            has_eps = self._has_eps_id
+            result = 0
+            derives_eps = True
+            for sym_id in beta:
+                result |= first_mask[sym_id]
+                if not has_eps[sym_id]:
+                    derives_eps = False
+                    break
+            cached = (result, derives_eps)
+            self._first_cache[beta] = cached
+        mask, derives_eps = cached
+        return mask | la_mask if derives_eps else mask
+
+    def closure(self, items):
+        # Worklist of cores with the lookahead bits added since their
+        # last visit; only those deltas are propagated, so total work is
+        # bounded by the growth of the lookahead masks. FIRST(beta) has
+        # already reached the children on the first visit, and re-adding
+        # it on revisits cannot grow anything.
+        acc = {}
+        pending = {}
+        queue = deque()
+        for item in items:
+            core = (item.left, item.right, item.dot)
+            acc[core] = item.lookahead
+            pending[core] = item.lookahead
+            queue.append(core)
+        num_terms = self.num_terms
+        rules_by_lhs = self._rules_by_lhs
+        while queue:
+            core = queue.popleft()
+            delta = pending.pop(core, 0)
+            if not delta:
+                continue
+            left, right, dot = core
+            if dot == len(right):
+                continue
+            next_sym = right[dot]
+            if next_sym < num_terms:
+                continue
+            lookaheads = self._first_beta_mask(right[dot + 1:], delta)
+            for right_ids in rules_by_lhs.get(next_sym, ()):
+                child = (next_sym, right_ids, 0)
+                existing = acc.get(child)
+                if existing is None:
+                    acc[child] = lookaheads
+                    pending[child] = lookaheads
+                    queue.append(child)
+                else:
+                    new = lookaheads & ~existing
+                    if new:
+                        acc[child] = existing | new
+                        already_queued = pending.get(child, 0)
+                        pending[child] = already_queued | new
+                        if not already_queued:
+                            queue.append(child)
+        return _State({LR1Item.make(left, right, dot, lookaheads)
+                       for (left, right, dot), lookaheads in acc.items()})
+
+    def goto(self, state, symbol):
+        items = state.by_next.get(symbol)
+        if not items:
+            return None
+        moved = {LR1Item.make(item.left, item.right, item.dot + 1,
+                              item.lookahead)
+                 for item in items}
+        return self.closure(moved)
+
+    @staticmethod
+    def _signature(state):
+        """Canonical identity of a state: sorted (core, lookahead) ints.
+
+        Comparing two signatures is a tuple-of-ints comparison instead
+        of a set-of-objects equality through every item's hash.
+        """
+        return tuple(sorted((item.left, item.right, item.dot, item.lookahead)
+                            for item in state))
+
+    def build_states(self):
+        start_item = LR1Item.make(self.sym2id[self.augmented_start],
+                                  (self.sym2id[self.grammar.start],),
+                                  0, self._end_bit)
+        initial = self.closure({start_item})
+        self.states = [initial]
+        self._state_index = {self._signature(initial.items): 0}
+        self.transitions = {}
+        queue = deque([0])
+        while queue:
+            idx = queue.popleft()
+            state = self.states[idx]
+            for symbol in state.by_next:
+                goto_state = self.goto(state, symbol)
+                key = self._signature(goto_state.items)
+                target = self._state_index.get(key)
+                if target is None:
+                    target = len(self.states)
+                    self.states.append(goto_state)
+                    self._state_index[key] = target
+                    queue.append(target)
+                self.transitions[(idx, symbol)] = target
+
+    def _set_action(self, idx, symbol, action):
+        existing = self.action_table[idx].get(symbol)
+        if existing is not None and existing != action:
+            raise GrammarError('Грамматика не является LR(1)')
+        self.action_table[idx][symbol] = action
+
+    def build_tables(self):
+        id2sym = self.id2sym
+        num_terms = self.num_terms
+        aug_id = self.sym2id[self.augmented_start]
+        self.action_table = [{} for _ in self.states]
+        self.goto_table = [{} for _ in self.states]
+        for idx, state in enumerate(self.states):
+            for item in state.completes:
+                if item.left == aug_id:
+                    if item.lookahead & self._end_bit:
+                        self._set_action(idx, '$', ('accept',))
+                else:
+                    reduce_action = ('reduce', id2sym[item.left], item.right)
+                    la_mask = item.lookahead
+                    while la_mask:
+                        bit = la_mask & -la_mask
+                        self._set_action(idx, id2sym[bit.bit_length() - 1],
+                                         reduce_action)
+                        la_mask ^= bit
+        # Shifts and gotos both come straight from the recorded
+        # transitions; no per-item scan is needed for either.
+        for (idx, symbol), target in self.transitions.items():
+            if symbol < num_terms:
+                self._set_action(idx, id2sym[symbol], ('shift', target))
+            else:
+                self.goto_table[idx][id2sym[symbol]] = target
+
+    def predict(self, word):
+        """Accepts either a raw word or an array from encode()."""
+        tokens = self.encode(word) if isinstance(word, str) else word
+        if tokens is None:
+            return False
+        if np is not None:
+            return bool(_drive(self.action_kind, self.action_arg,
+                               self.goto_tbl, self._rhs_len, self._rhs_lhs,
+                               tokens))
+        action_kind = self.action_kind
+        action_arg = self.action_arg
+        goto_tbl = self.goto_tbl
+        rhs_len = self._rhs_len
+        rhs_lhs = self._rhs_lhs
+        # Preallocated stack with a manual top pointer, mirroring _drive;
+        # nullable rules can push past any input-length bound, so the
+        # stack is doubled on demand rather than treating overflow as a
+        # rejection.
+        stack = [0] * (2 * len(tokens) + 16)
+        sp = 0
+        cursor = 0
+        while True:
+            state = stack[sp]
+            tok = tokens[cursor]
+            kind = action_kind[state][tok]
+            if kind == _SHIFT:
+                if sp + 1 >= len(stack):
+                    stack.extend([0] * len(stack))
+                sp += 1
+                stack[sp] = action_arg[state][tok]
+                cursor += 1
+            elif kind == _REDUCE:
+                rule_id = action_arg[state][tok]
+                sp -= rhs_len[rule_id]
+                if sp < 0:
+                    return False
+                target = goto_tbl[stack[sp]][rhs_lhs[rule_id]]
+                if target < 0:
+                    return False
+                if sp + 1 >= len(stack):
+                    stack.extend([0] * len(stack))
+                sp += 1
+                stack[sp] = target
+            elif kind == _ACCEPT:
+                return True
+            else:
+                return False
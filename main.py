@@ -0,0 +1,49 @@
+"""Console entry point: read a grammar and words from stdin, print Yes/No."""
+
+import sys
+
+from grammar import EPSILON, Grammar, GrammarError, Rule
+from lr0_parser import LR0Parser
+
+
+def read_input(data=None):
+    """Parse the whole input: grammar sizes, symbols, rules and words."""
+    if data is None:
+        data = sys.stdin.read().splitlines()
+    it = iter(data)
+    nxt = it.__next__
+    try:
+        _, _, num_rules = (int(part) for part in nxt().split())
+        non_terminals = set(nxt().replace(' ', ''))
+        terminals = set(nxt().replace(' ', ''))
+        rules = []
+        rules_append = rules.append
+        for _ in range(num_rules):
+            line = nxt().strip()
+            if '->' not in line:
+                raise GrammarError('Некорректный формат правила')
+            left, right = line.split('->', 1)
+            left = left.strip()
+            right = right.strip()
+            right_symbols = tuple(right) if right and right != EPSILON else ()
+            rules_append(Rule(left, right_symbols))
+        start = nxt().strip()
+        num_words = int(nxt())
+        words = [nxt() for _ in range(num_words)]
+    except (StopIteration, ValueError):
+        raise GrammarError('Некорректный формат входа') from None
+    return Grammar(non_terminals, terminals, rules, start), words
+
+
+def main():
+    grammar, words = read_input()
+    parser = LR0Parser().fit(grammar)
+    out = sys.stdout
+    for word in words:
+        tokens = parser.encode(word)
+        accepted = tokens is not None and parser.predict(tokens)
+        out.write('Yes\n' if accepted else 'No\n')
+
+
+if __name__ == '__main__':
+    main()